@@ -2,6 +2,8 @@ import logging
 import time
 
 import duckdb
+import pandas as pd
+import pyarrow as pa
 from backend.config import MOTHERDUCK_TOKEN, MOTHERDUCK_DB
 
 logger = logging.getLogger("backtester.db")
@@ -35,15 +37,56 @@ def _reset_connection():
     logger.info("MotherDuck connection reset")
 
 
+def _arrow_string_dtype(arrow_type):
+    """Keep string columns Arrow-backed; numeric columns stay plain numpy."""
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def _table_to_df(table: pa.Table):
+    return table.to_pandas(
+        date_as_object=False,
+        split_blocks=True,
+        self_destruct=True,
+        types_mapper=_arrow_string_dtype,
+    )
+
+
 def query_df(sql: str, params: list | None = None):
-    """Execute SQL and return a pandas DataFrame. Auto-reconnects on failure."""
+    """Execute SQL and return a pandas DataFrame. Auto-reconnects on failure.
+
+    Results come through Arrow rather than fetchdf() so string columns
+    (ticker, ids) stay Arrow-backed instead of being materialized as
+    per-row Python objects.
+    """
     global _conn
     for attempt in range(2):
         try:
             conn = get_connection()
-            if params:
-                return conn.execute(sql, params).fetchdf()
-            return conn.execute(sql).fetchdf()
+            cursor = conn.execute(sql, params) if params else conn.execute(sql)
+            return _table_to_df(cursor.fetch_arrow_table())
+        except Exception as e:
+            if attempt == 0:
+                logger.warning(f"Query failed (attempt 1), reconnecting: {e}")
+                _reset_connection()
+                continue
+            logger.error(f"Query failed (attempt 2): {e}")
+            raise e
+
+
+def query_df_threadsafe(sql: str, params: list | None = None):
+    """query_df variant for worker threads: runs on its own cursor so
+    concurrent reads don't serialize on the shared connection object."""
+    global _conn
+    for attempt in range(2):
+        try:
+            cursor = get_connection().cursor()
+            try:
+                res = cursor.execute(sql, params) if params else cursor.execute(sql)
+                return _table_to_df(res.fetch_arrow_table())
+            finally:
+                cursor.close()
         except Exception as e:
             if attempt == 0:
                 logger.warning(f"Query failed (attempt 1), reconnecting: {e}")
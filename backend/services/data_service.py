@@ -11,8 +11,10 @@ import logging
 import sys
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
-from backend.db.connection import query_df, execute_sql
+from backend.db.connection import query_df, query_df_threadsafe, execute_sql
 
 logger = logging.getLogger("backtester.data")
 
@@ -121,51 +123,56 @@ def fetch_dataset_data(dataset_id: str) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
     t0 = time.time()
 
+    # "yesterday" means the previous *trading* day, so the prior row is
+    # looked up per pair with an ASOF join over the ticker's history —
+    # calendar arithmetic (date - 1) would return NULL for Mondays and
+    # post-holiday sessions. The ticker filter still prunes the
+    # daily_metrics scan to the dataset's symbols.
     qualifying_sql = """
-    WITH relevant_tickers AS (
-        SELECT DISTINCT ticker FROM dataset_pairs WHERE dataset_id = ?
-    ),
-    filtered_dm AS (
+    WITH filtered_dm AS MATERIALIZED (
         SELECT dm.*,
                CAST(dm."timestamp" AS DATE) AS date
         FROM daily_metrics dm
-        WHERE dm.ticker IN (SELECT ticker FROM relevant_tickers)
-    ),
-    enriched AS (
-        SELECT f.*,
-               LAG(f.rth_high) OVER (PARTITION BY f.ticker ORDER BY f."timestamp") AS yesterday_high,
-               LAG(f.rth_low)  OVER (PARTITION BY f.ticker ORDER BY f."timestamp") AS yesterday_low,
-               f.prev_close AS previous_close
-        FROM filtered_dm f
+        WHERE dm.ticker IN (SELECT DISTINCT ticker FROM dataset_pairs WHERE dataset_id = ?)
     )
-    SELECT e.*
+    SELECT f.*,
+           prev.rth_high AS yesterday_high,
+           prev.rth_low  AS yesterday_low,
+           f.prev_close  AS previous_close
     FROM dataset_pairs dp
-    INNER JOIN enriched e ON dp.ticker = e.ticker AND dp.date = e.date
+    INNER JOIN filtered_dm f ON f.ticker = dp.ticker AND f.date = dp.date
+    ASOF LEFT JOIN filtered_dm prev
+        ON prev.ticker = f.ticker AND prev.date < f.date
     WHERE dp.dataset_id = ?
     """
-    qualifying = query_df(qualifying_sql, [dataset_id, dataset_id])
-    t_q = time.time()
-    logger.info(f"qualifying query: {len(qualifying)} rows ({round(t_q - t0, 2)}s)")
-
-    if qualifying.empty:
-        return qualifying, pd.DataFrame()
-
     intraday_sql = """
-    SELECT i.ticker, i.date, i."timestamp", i.open, i.high, i.low,
-           i."close", i.volume
+    SELECT i.ticker, i.date, i."timestamp",
+           CAST(i.open AS FLOAT) AS open, CAST(i.high AS FLOAT) AS high,
+           CAST(i.low AS FLOAT) AS low, CAST(i."close" AS FLOAT) AS "close",
+           CAST(i.volume AS INTEGER) AS volume
     FROM intraday_1m i
     INNER JOIN dataset_pairs dp ON i.ticker = dp.ticker AND i.date = dp.date
     WHERE dp.dataset_id = ?
     """
-    intraday = query_df(intraday_sql, [dataset_id])
-    t_i = time.time()
-    logger.info(f"intraday query: {len(intraday)} rows ({round(t_i - t_q, 2)}s)")
-
-    for col in ("open", "high", "low", "close"):
-        if col in intraday.columns:
-            intraday[col] = intraday[col].astype("float32")
-    if "volume" in intraday.columns:
-        intraday["volume"] = intraday["volume"].astype("int32")
+
+    # Both queries only depend on dataset_id; overlap them on two cursors.
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        fut_q = ex.submit(query_df_threadsafe, qualifying_sql, [dataset_id, dataset_id])
+        fut_i = ex.submit(query_df_threadsafe, intraday_sql, [dataset_id])
+        qualifying = fut_q.result()
+        intraday = fut_i.result()
+
+    if "ticker" in qualifying.columns:
+        qualifying["ticker"] = qualifying["ticker"].astype("category")
+    t_q = time.time()
+    logger.info(
+        f"qualifying+intraday queries: {len(qualifying)} / {len(intraday)} rows "
+        f"({round(t_q - t0, 2)}s)"
+    )
+
+    if qualifying.empty:
+        return qualifying, pd.DataFrame()
+
     if "ticker" in intraday.columns:
         intraday["ticker"] = intraday["ticker"].astype("category")
     if "date" in intraday.columns:
@@ -3,12 +3,26 @@ Computes technical indicators from OHLCV data.
 Pure numpy/pandas implementations — no vectorbt dependency.
 """
 
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
 
 import os as _os
 
-_HAS_NUMBA = False
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
 
 try:
     import talib as _talib
@@ -21,6 +35,33 @@ except ImportError:
     ta = None
 
 
+def _shifted(series: pd.Series, k: int) -> pd.Series:
+    """Series.shift without the block-manager round trip.
+
+    One buffer, one slice copy, one NaN fill — the cached unshifted base
+    stays untouched, so every offset variant is a cheap derived copy.
+    """
+    arr = series.to_numpy(copy=False)
+    out = np.empty(len(arr), dtype=arr.dtype if arr.dtype.kind == "f" else np.float64)
+    if k > 0:
+        out[:k] = np.nan
+        out[k:] = arr[:-k]
+    else:
+        out[k:] = np.nan
+        out[:k] = arr[-k:]
+    return pd.Series(out, index=series.index, copy=False)
+
+
+def _const_series(value: float, index: pd.Index) -> pd.Series:
+    """Constant Series over a zero-copy broadcast view.
+
+    Indicator consumers are read-only, so no N-length buffer is allocated;
+    pandas materializes a real array only if someone writes to it.
+    """
+    arr = np.broadcast_to(np.float64(value), (len(index),))
+    return pd.Series(arr, index=index, copy=False)
+
+
 # ---------------------------------------------------------------------------
 # Pure-numpy indicator implementations
 # ---------------------------------------------------------------------------
@@ -78,16 +119,25 @@ def _atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int) -> n
 
 
 def _vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray) -> np.ndarray:
-    typical = (high + low + close) / 3.0
-    cum_tp_vol = np.cumsum(typical * volume)
-    cum_vol = np.cumsum(volume)
+    # One working buffer: accumulate typical*volume in place, then cumsum
+    # into the same memory — no intermediate typical/tp*vol temporaries.
+    # Computes in the price arrays' dtype: float32 candles stay float32
+    # (half the memory traffic), which is ample for a few hundred bars.
+    tp_vol = np.add(high, low)
+    np.add(tp_vol, close, out=tp_vol)
+    np.multiply(tp_vol, volume, out=tp_vol)
+    np.multiply(tp_vol, 1.0 / 3.0, out=tp_vol)
+    np.cumsum(tp_vol, out=tp_vol)
+    cum_vol = np.cumsum(volume, dtype=tp_vol.dtype)
     with np.errstate(divide="ignore", invalid="ignore"):
-        return np.where(cum_vol != 0, cum_tp_vol / cum_vol, np.nan)
+        return np.where(cum_vol != 0, tp_vol / cum_vol, np.nan)
 
 
+@njit(cache=True)
 def _consecutive_count(signal: np.ndarray) -> np.ndarray:
     n = len(signal)
-    result = np.zeros(n, dtype=np.float64)
+    # Counts are small integers, exact in float32 — half the output buffer.
+    result = np.zeros(n, dtype=np.float32)
     count = 0.0
     for i in range(n):
         if signal[i]:
@@ -98,18 +148,289 @@ def _consecutive_count(signal: np.ndarray) -> np.ndarray:
     return result
 
 
-def _hammer(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
-    body = np.abs(close - open_)
-    full_range = high - low + 1e-10
-    lower_wick = np.minimum(open_, close) - low
-    return (lower_wick >= 2 * body) & (body / full_range < 0.4)
+# Candle-shape flags, all derived from one pass over OHLC.
+_BIT_DOJI = 1
+_BIT_HAMMER = 2
+_BIT_SHOOTING_STAR = 4
+_BIT_GREEN = 8
+_BIT_RED = 16
 
 
-def _shooting_star(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+@njit(cache=True)
+def _candle_flags_nb(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    n = len(close)
+    flags = np.empty(n, dtype=np.uint8)
+    for i in range(n):
+        body = abs(close[i] - open_[i])
+        # Epsilon matches the original body/(range+1e-10) ratio: a flat
+        # O=H=L=C bar has ratio 0 and counts as doji/small-body.
+        full_range = high[i] - low[i] + 1e-10
+        lower_wick = min(open_[i], close[i]) - low[i]
+        upper_wick = high[i] - max(open_[i], close[i])
+        small_body = body < 0.4 * full_range
+        f = 0
+        if body < 0.1 * full_range:
+            f |= _BIT_DOJI
+        if lower_wick >= 2 * body and small_body:
+            f |= _BIT_HAMMER
+        if upper_wick >= 2 * body and small_body:
+            f |= _BIT_SHOOTING_STAR
+        if close[i] > open_[i]:
+            f |= _BIT_GREEN
+        if close[i] < open_[i]:
+            f |= _BIT_RED
+        flags[i] = f
+    return flags
+
+
+def _candle_flags_np(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
     body = np.abs(close - open_)
     full_range = high - low + 1e-10
-    upper_wick = high - np.maximum(open_, close)
-    return (upper_wick >= 2 * body) & (body / full_range < 0.4)
+    small_body = body < 0.4 * full_range
+    flags = (body < 0.1 * full_range).astype(np.uint8)
+    flags |= np.uint8(_BIT_HAMMER) * (((np.minimum(open_, close) - low) >= 2 * body) & small_body)
+    flags |= np.uint8(_BIT_SHOOTING_STAR) * (((high - np.maximum(open_, close)) >= 2 * body) & small_body)
+    flags |= np.uint8(_BIT_GREEN) * (close > open_)
+    flags |= np.uint8(_BIT_RED) * (close < open_)
+    return flags
+
+
+_candle_flags = _candle_flags_nb if _HAS_NUMBA else _candle_flags_np
+
+
+# Indicators the fused batch kernel can compute in its single OHLCV pass.
+_FUSED_SMA = 0
+_FUSED_EMA = 1
+_FUSED_RSI = 2
+_FUSED_ATR = 3
+_FUSED_VWAP = 4
+_FUSED_KINDS = {
+    "SMA": _FUSED_SMA,
+    "EMA": _FUSED_EMA,
+    "RSI": _FUSED_RSI,
+    "ATR": _FUSED_ATR,
+    "VWAP": _FUSED_VWAP,
+    "AVWAP": _FUSED_VWAP,
+}
+
+
+@njit(cache=True)
+def _fused_indicators_nb(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    kinds: np.ndarray,
+    periods: np.ndarray,
+    out: np.ndarray,
+) -> None:
+    """Compute all requested SMA/EMA/RSI/ATR/VWAP columns in one pass.
+
+    Each bar is read from RAM once and fanned out to every indicator's
+    running state (window sums, EMA recursions, Wilder averages, VWAP
+    accumulators) instead of one full array pass per indicator.
+    """
+    n = len(close)
+    m = len(kinds)
+    # Per-indicator running state; meaning depends on the kind.
+    s1 = np.zeros(m)  # SMA window sum / EMA seed sum / RSI gain state / ATR seed
+    s2 = np.zeros(m)  # EMA value / RSI loss state / ATR value
+    s3 = np.zeros(m)  # RSI gain EMA
+    s4 = np.zeros(m)  # RSI loss EMA
+    prev_close = 0.0
+    cum_tp_vol = 0.0
+    cum_vol = 0.0
+    for i in range(n):
+        c = close[i]
+        h = high[i]
+        l = low[i]
+        if i == 0:
+            tr = h - l
+            delta = 0.0
+        else:
+            tr = max(h - l, abs(h - prev_close), abs(l - prev_close))
+            delta = c - prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        cum_tp_vol += (h + l + c) * volume[i] * (1.0 / 3.0)
+        cum_vol += volume[i]
+        for j in range(m):
+            kind = kinds[j]
+            p = periods[j]
+            val = np.nan
+            if kind == _FUSED_SMA:
+                s1[j] += c
+                if i >= p:
+                    s1[j] -= close[i - p]
+                if i >= p - 1:
+                    val = s1[j] / p
+            elif kind == _FUSED_EMA:
+                if i < p - 1:
+                    s1[j] += c
+                elif i == p - 1:
+                    s2[j] = (s1[j] + c) / p
+                    val = s2[j]
+                else:
+                    alpha = 2.0 / (p + 1)
+                    s2[j] = alpha * c + (1 - alpha) * s2[j]
+                    val = s2[j]
+            elif kind == _FUSED_RSI:
+                # EMA-smoothed gains/losses over the delta stream (bar >= 1).
+                if i >= 1:
+                    di = i - 1
+                    ready = False
+                    if di < p - 1:
+                        s1[j] += gain
+                        s2[j] += loss
+                    elif di == p - 1:
+                        s3[j] = (s1[j] + gain) / p
+                        s4[j] = (s2[j] + loss) / p
+                        ready = True
+                    else:
+                        alpha = 2.0 / (p + 1)
+                        s3[j] = alpha * gain + (1 - alpha) * s3[j]
+                        s4[j] = alpha * loss + (1 - alpha) * s4[j]
+                        ready = True
+                    if ready and s4[j] != 0:
+                        val = 100.0 - 100.0 / (1.0 + s3[j] / s4[j])
+            elif kind == _FUSED_ATR:
+                if i < p - 1:
+                    s1[j] += tr
+                elif i == p - 1:
+                    s2[j] = (s1[j] + tr) / p
+                    val = s2[j]
+                else:
+                    alpha = 2.0 / (p + 1)
+                    s2[j] = alpha * tr + (1 - alpha) * s2[j]
+                    val = s2[j]
+            else:  # _FUSED_VWAP
+                if cum_vol != 0:
+                    val = cum_tp_vol / cum_vol
+            out[i, j] = val
+        prev_close = c
+
+
+# ---------------------------------------------------------------------------
+# Incremental (streaming) indicators
+# ---------------------------------------------------------------------------
+# O(1)-per-bar counterparts of _sma/_ema/_rsi for append-only workloads
+# (live bar-by-bar evaluation). push(x) returns the same value the batch
+# function would produce for the latest bar, so results are interchangeable.
+
+class IncrementalSMA:
+    def __init__(self, period: int):
+        self.period = period
+        self._buf = np.empty(period, dtype=np.float64)
+        self._count = 0
+        self._sum = 0.0
+
+    def push(self, value: float) -> float:
+        pos = self._count % self.period
+        if self._count >= self.period:
+            self._sum -= self._buf[pos]
+        self._buf[pos] = value
+        self._sum += value
+        self._count += 1
+        if self._count < self.period:
+            return np.nan
+        return self._sum / self.period
+
+
+class IncrementalEMA:
+    def __init__(self, period: int):
+        self.period = period
+        self._alpha = 2.0 / (period + 1)
+        self._seed_sum = 0.0
+        self._count = 0
+        self._ema = np.nan
+
+    def push(self, value: float) -> float:
+        self._count += 1
+        if self._count < self.period:
+            self._seed_sum += value
+            return np.nan
+        if self._count == self.period:
+            self._ema = (self._seed_sum + value) / self.period
+            return self._ema
+        self._ema = self._alpha * value + (1 - self._alpha) * self._ema
+        return self._ema
+
+
+class IncrementalRSI:
+    def __init__(self, period: int):
+        self.period = period
+        self._gain_ema = IncrementalEMA(period)
+        self._loss_ema = IncrementalEMA(period)
+        self._prev = np.nan
+
+    def push(self, close: float) -> float:
+        prev = self._prev
+        self._prev = close
+        if np.isnan(prev):
+            return np.nan
+        delta = close - prev
+        avg_gain = self._gain_ema.push(delta if delta > 0 else 0.0)
+        avg_loss = self._loss_ema.push(-delta if delta < 0 else 0.0)
+        if np.isnan(avg_gain) or np.isnan(avg_loss) or avg_loss == 0:
+            return np.nan
+        rs = avg_gain / avg_loss
+        return 100.0 - 100.0 / (1.0 + rs)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide indicator cache
+# ---------------------------------------------------------------------------
+
+class IndicatorCache:
+    """Bounded LRU for computed indicators, shared across strategies.
+
+    Keys carry a cheap fingerprint of the close array (buffer address,
+    length) instead of hashing the whole array. The address alone is not
+    a safe identifier — the allocator recycles freed buffers, and the
+    per-day frames in run_backtest die quickly — so each entry also
+    stores the source array itself: holding it keeps its buffer alive,
+    which means a later array at the same address *is* the same buffer,
+    and a hit is only honored after that identity check. The pinned
+    source arrays are why the cache stays small.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self._data: OrderedDict = OrderedDict()
+        self._maxsize = maxsize
+
+    def get(self, key, default=None):
+        try:
+            self._data.move_to_end(key)
+            return self._data[key]
+        except KeyError:
+            return default
+
+    def put(self, key, value) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+_indicator_cache = IndicatorCache()
+_CACHE_MISS = object()
+
+
+# Indicators that are pure functions of daily_stats (scalar dict lookups).
+# They must not be cached under a close-based key — two frames with equal
+# closes but different daily_stats would alias — and caching them buys
+# nothing anyway.
+_DAY_STAT_NAMES = frozenset({
+    "Pre-Market High",
+    "Pre-Market Low",
+    "Yesterday High",
+    "Yesterday Low",
+    "Yesterday Close",
+    "Ret % PM",
+})
 
 
 # ---------------------------------------------------------------------------
@@ -123,7 +444,7 @@ def compute_indicator(
     offset: int = 0,
     daily_stats: dict | None = None,
     cache: dict | None = None,
-) -> pd.Series:
+) -> pd.Series | float:
     cache_key = (name, period, offset)
     if cache is not None and cache_key in cache:
         return cache[cache_key]
@@ -134,10 +455,28 @@ def compute_indicator(
     open_ = df["open"]
     volume = df["volume"]
 
-    result = _compute_raw(name, close, high, low, open_, volume, period, daily_stats, df)
+    # Process-wide memo keyed without the offset: shifting is cheap, so one
+    # cached base result serves every offset variant. daily_stats-derived
+    # scalars bypass it — see _DAY_STAT_NAMES.
+    result = _CACHE_MISS
+    if name not in _DAY_STAT_NAMES:
+        close_arr = close.to_numpy(copy=False)
+        global_key = (name, period, close_arr.ctypes.data, len(close_arr))
+        entry = _indicator_cache.get(global_key, _CACHE_MISS)
+        if entry is not _CACHE_MISS and np.shares_memory(entry[0], close_arr):
+            result = entry[1]
+    if result is _CACHE_MISS:
+        result = _compute_raw(name, close, high, low, open_, volume, period, daily_stats, df)
+        if name not in _DAY_STAT_NAMES:
+            _indicator_cache.put(global_key, (close_arr, result))
 
     if offset and offset != 0:
-        result = result.shift(offset)
+        # A shifted day-constant is not a constant: the first/last |offset|
+        # bars are NaN, same as Series.shift on the materialized column, so
+        # comparisons there stay False. Scalars materialize only here.
+        if not isinstance(result, pd.Series):
+            result = _const_series(float(result), close.index)
+        result = _shifted(result, offset)
 
     if cache is not None:
         cache[cache_key] = result
@@ -145,6 +484,82 @@ def compute_indicator(
     return result
 
 
+def compute_indicators_bulk(
+    df: pd.DataFrame,
+    specs: list[tuple[str, int | None, int]],
+    daily_stats: dict | None = None,
+) -> dict[tuple[str, int | None, int], np.ndarray]:
+    """
+    Compute several indicators over the same OHLCV frame in one batch.
+
+    specs is a list of (name, period, offset) tuples. All computations share
+    one cache, so duplicate specs and shared inputs are evaluated once, and
+    the results land in a single (n_bars x n_indicators) float32 block —
+    SoA layout for vectorized strategy evaluation downstream. Returns a dict
+    mapping each spec to its column view into that block.
+    """
+    n = len(df)
+    block = np.empty((n, len(specs)), dtype=np.float32)
+    cache: dict = {}
+    out: dict[tuple[str, int | None, int], np.ndarray] = {}
+
+    # Routine lookups (SMA/EMA/RSI/ATR/VWAP) are fused into a single pass
+    # over the OHLCV arrays instead of one full array walk per indicator.
+    # TA-Lib, when installed, stays the authoritative backend for these.
+    fused_cols: dict[tuple[int, int], int] = {}
+    if _HAS_NUMBA and _talib is None:
+        for name, period, _offset in specs:
+            kind = _FUSED_KINDS.get(name)
+            if kind is None:
+                continue
+            p = period or (14 if kind in (_FUSED_RSI, _FUSED_ATR) else 20)
+            fused_cols.setdefault((kind, p), len(fused_cols))
+    if fused_cols:
+        kinds = np.empty(len(fused_cols), dtype=np.int64)
+        periods = np.empty(len(fused_cols), dtype=np.int64)
+        for (kind, p), jj in fused_cols.items():
+            kinds[jj] = kind
+            periods[jj] = p
+        fused_out = np.empty((n, len(fused_cols)), dtype=np.float64)
+        # No float64 upcast copies: the kernel specializes on the native
+        # (typically float32) candle dtype and accumulates state in float64.
+        _fused_indicators_nb(
+            np.ascontiguousarray(df["high"].to_numpy(copy=False)),
+            np.ascontiguousarray(df["low"].to_numpy(copy=False)),
+            np.ascontiguousarray(df["close"].to_numpy(copy=False)),
+            np.ascontiguousarray(df["volume"].to_numpy(copy=False), dtype=np.float64)
+            if df["volume"].to_numpy(copy=False).dtype.kind not in "fc"
+            else np.ascontiguousarray(df["volume"].to_numpy(copy=False)),
+            kinds, periods, fused_out,
+        )
+
+    for j, (name, period, offset) in enumerate(specs):
+        kind = _FUSED_KINDS.get(name)
+        if fused_cols and kind is not None:
+            p = period or (14 if kind in (_FUSED_RSI, _FUSED_ATR) else 20)
+            col = fused_out[:, fused_cols[(kind, p)]]
+            k = offset or 0
+            if k == 0:
+                block[:, j] = col
+            elif k > 0:
+                block[:k, j] = np.nan
+                block[k:, j] = col[:-k]
+            else:
+                block[k:, j] = np.nan
+                block[:k, j] = col[-k:]
+        else:
+            result = compute_indicator(
+                name, df, period=period, offset=offset,
+                daily_stats=daily_stats, cache=cache,
+            )
+            if isinstance(result, pd.Series):
+                block[:, j] = result.to_numpy(copy=False)
+            else:
+                block[:, j] = result
+        out[(name, period, offset)] = block[:, j]
+    return out
+
+
 def _compute_raw(
     name: str,
     close: pd.Series,
@@ -155,9 +570,15 @@ def _compute_raw(
     period: int | None,
     daily_stats: dict | None,
     df: pd.DataFrame,
-) -> pd.Series:
+) -> pd.Series | float:
     ds = daily_stats or {}
 
+    close_v = close.to_numpy(copy=False)
+    high_v = high.to_numpy(copy=False)
+    low_v = low.to_numpy(copy=False)
+    open_v = open_.to_numpy(copy=False)
+    volume_v = volume.to_numpy(copy=False)
+
     if name == "Close":
         return close
     if name == "Open":
@@ -170,92 +591,113 @@ def _compute_raw(
         return volume.astype(float)
 
     if name == "SMA":
-        return pd.Series(_sma(close.values, period or 20), index=close.index)
+        if _talib is not None:
+            return pd.Series(_talib.SMA(close_v, timeperiod=period or 20), index=close.index)
+        return pd.Series(_sma(close_v, period or 20), index=close.index)
     if name == "EMA":
-        return pd.Series(_ema(close.values, period or 20), index=close.index)
+        if _talib is not None:
+            return pd.Series(_talib.EMA(close_v, timeperiod=period or 20), index=close.index)
+        return pd.Series(_ema(close_v, period or 20), index=close.index)
     if name == "RSI":
-        return pd.Series(_rsi(close.values, period or 14), index=close.index)
+        if _talib is not None:
+            return pd.Series(_talib.RSI(close_v, timeperiod=period or 14), index=close.index)
+        return pd.Series(_rsi(close_v, period or 14), index=close.index)
     if name == "MACD":
-        return pd.Series(_macd(close.values), index=close.index)
+        if _talib is not None:
+            macd_line, _, _ = _talib.MACD(close_v)
+            return pd.Series(macd_line, index=close.index)
+        return pd.Series(_macd(close_v), index=close.index)
     if name == "ATR":
-        return pd.Series(_atr(high.values, low.values, close.values, period or 14), index=close.index)
+        if _talib is not None:
+            return pd.Series(
+                _talib.ATR(high_v, low_v, close_v, timeperiod=period or 14),
+                index=close.index,
+            )
+        return pd.Series(_atr(high_v, low_v, close_v, period or 14), index=close.index)
 
     if name == "WMA":
         if _talib is not None:
-            return pd.Series(_talib.WMA(close.values, timeperiod=period or 20), index=close.index)
+            return pd.Series(_talib.WMA(close_v, timeperiod=period or 20), index=close.index)
         if ta is not None:
             return ta.wma(close, length=period or 20)
     if name == "ADX":
         if _talib is not None:
             return pd.Series(
-                _talib.ADX(high.values, low.values, close.values, timeperiod=period or 14),
+                _talib.ADX(high_v, low_v, close_v, timeperiod=period or 14),
                 index=close.index,
             )
         if ta is not None:
             adx_df = ta.adx(high, low, close, length=period or 14)
-            return adx_df.iloc[:, 0] if adx_df is not None else pd.Series(np.nan, index=close.index)
+            return adx_df.iloc[:, 0] if adx_df is not None else _const_series(np.nan, close.index)
     if name == "Williams %R":
         if _talib is not None:
             return pd.Series(
-                _talib.WILLR(high.values, low.values, close.values, timeperiod=period or 14),
+                _talib.WILLR(high_v, low_v, close_v, timeperiod=period or 14),
                 index=close.index,
             )
         if ta is not None:
             return ta.willr(high, low, close, length=period or 14)
 
     if name in ("VWAP", "AVWAP"):
-        vals = _vwap(high.values, low.values, close.values, volume.values.astype(np.float64))
+        vals = _vwap(high_v, low_v, close_v, volume_v)
         return pd.Series(vals, index=close.index)
 
+    # Constant-per-day levels: return a scalar float and let pandas/numpy
+    # broadcast downstream instead of allocating an N-length Series.
     if name == "Pre-Market High":
-        return pd.Series(ds.get("pm_high", np.nan), index=close.index)
+        return float(ds.get("pm_high", np.nan))
     if name == "Pre-Market Low":
-        return pd.Series(ds.get("pm_low", np.nan), index=close.index)
+        return float(ds.get("pm_low", np.nan))
     if name == "High of Day":
         return high.cummax()
     if name == "Low of Day":
         return low.cummin()
     if name == "Yesterday High":
-        return pd.Series(ds.get("yesterday_high", np.nan), index=close.index)
+        return float(ds.get("yesterday_high", np.nan))
     if name == "Yesterday Low":
-        return pd.Series(ds.get("yesterday_low", np.nan), index=close.index)
+        return float(ds.get("yesterday_low", np.nan))
     if name == "Yesterday Close":
-        return pd.Series(ds.get("previous_close", np.nan), index=close.index)
+        return float(ds.get("previous_close", np.nan))
 
     if name == "Accumulated Volume":
         return volume.cumsum().astype(float)
     if name == "Consecutive Red Candles":
-        signal = (close.values < open_.values)
+        signal = (close_v < open_v)
         return pd.Series(_consecutive_count(signal), index=close.index)
     if name == "Consecutive Higher Highs":
         hh = np.empty(len(high), dtype=np.bool_)
         hh[0] = False
-        hh[1:] = high.values[1:] > high.values[:-1]
+        hh[1:] = high_v[1:] > high_v[:-1]
         return pd.Series(_consecutive_count(hh), index=close.index)
     if name == "Consecutive Lower Lows":
         ll = np.empty(len(low), dtype=np.bool_)
         ll[0] = False
-        ll[1:] = low.values[1:] < low.values[:-1]
+        ll[1:] = low_v[1:] < low_v[:-1]
         return pd.Series(_consecutive_count(ll), index=close.index)
 
     if name == "Ret % PM":
         pm_h = ds.get("pm_high", np.nan)
         prev_c = ds.get("previous_close", np.nan)
-        val = (pm_h - prev_c) / prev_c * 100 if prev_c and prev_c > 0 else np.nan
-        return pd.Series(val, index=close.index)
-    if name == "Ret % RTH":
-        return (close - open_.iloc[0]) / open_.iloc[0] * 100 if open_.iloc[0] > 0 else pd.Series(np.nan, index=close.index)
-    if name == "Ret % AM":
-        return (close - open_.iloc[0]) / open_.iloc[0] * 100 if open_.iloc[0] > 0 else pd.Series(np.nan, index=close.index)
+        return float((pm_h - prev_c) / prev_c * 100) if prev_c and prev_c > 0 else np.nan
+    if name in ("Ret % RTH", "Ret % AM"):
+        o0 = open_.iat[0] if len(open_) else 0.0
+        if not o0 > 0:
+            return _const_series(np.nan, close.index)
+        # One scalar divide up front; per-element divide becomes a multiply.
+        return (close - o0) * (100.0 / o0)
 
     if name == "Time of Day":
-        ts = pd.to_datetime(df["timestamp"])
-        return ts.dt.hour * 60 + ts.dt.minute
+        ts = df["timestamp"]
+        if ts.dtype.kind != "M":
+            ts = pd.to_datetime(ts)
+        # Minutes since midnight in one integer pass — no .dt accessor round-trips.
+        tod = ts.to_numpy().astype("datetime64[m]").view("int64") % 1440
+        return pd.Series(tod, index=close.index)
 
     if name == "Max N Bars":
         return pd.Series(np.arange(len(close), dtype=float), index=close.index)
 
-    return pd.Series(np.nan, index=close.index)
+    return _const_series(np.nan, close.index)
 
 
 def detect_candle_pattern(
@@ -271,28 +713,25 @@ def detect_candle_pattern(
     volume = df["volume"].values
     idx = df.index
 
+    # All shape flags come out of one fused pass; selection is a bit test.
+    flags = _candle_flags(open_, high, low, close)
+
     if pattern == "GREEN_VOLUME":
-        sig = close > open_
+        sig = (flags & _BIT_GREEN) != 0
     elif pattern == "GREEN_VOLUME_PLUS":
-        vol_up = np.empty(len(volume), dtype=np.bool_)
-        vol_up[0] = False
-        vol_up[1:] = volume[1:] > volume[:-1]
-        sig = (close > open_) & vol_up
+        vol_up = np.diff(volume, prepend=volume[0]) > 0
+        sig = ((flags & _BIT_GREEN) != 0) & vol_up
     elif pattern == "RED_VOLUME":
-        sig = close < open_
+        sig = (flags & _BIT_RED) != 0
     elif pattern == "RED_VOLUME_PLUS":
-        vol_up = np.empty(len(volume), dtype=np.bool_)
-        vol_up[0] = False
-        vol_up[1:] = volume[1:] > volume[:-1]
-        sig = (close < open_) & vol_up
+        vol_up = np.diff(volume, prepend=volume[0]) > 0
+        sig = ((flags & _BIT_RED) != 0) & vol_up
     elif pattern == "DOJI":
-        body = np.abs(close - open_)
-        full_range = high - low + 1e-10
-        sig = (body / full_range) < 0.1
+        sig = (flags & _BIT_DOJI) != 0
     elif pattern == "HAMMER":
-        sig = _hammer(open_, high, low, close)
+        sig = (flags & _BIT_HAMMER) != 0
     elif pattern == "SHOOTING_STAR":
-        sig = _shooting_star(open_, high, low, close)
+        sig = (flags & _BIT_SHOOTING_STAR) != 0
     else:
         return pd.Series(False, index=idx)
 
@@ -302,7 +741,9 @@ def detect_candle_pattern(
         signal = signal.shift(lookback).fillna(False).astype(bool)
 
     if consecutive_count > 1:
-        rolling_sum = signal.astype(int).rolling(window=consecutive_count, min_periods=consecutive_count).sum()
-        signal = rolling_sum >= consecutive_count
+        # "k in a row" == current run length >= k; one pass through the
+        # run-length kernel beats the rolling-sum aggregator setup.
+        runs = _consecutive_count(signal.to_numpy())
+        signal = pd.Series(runs >= consecutive_count, index=idx)
 
     return signal.astype(bool)
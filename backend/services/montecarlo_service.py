@@ -5,43 +5,73 @@ Produces percentile equity curves and risk metrics.
 
 import numpy as np
 
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:  # numba is optional; fall back to plain numpy
+    _HAS_NUMBA = False
+
+if _HAS_NUMBA:
+    @njit(cache=True, parallel=True)
+    def _ruin_count_nb(curves, threshold):
+        """Count rows that ever drop below threshold, stopping each row scan
+        at the first ruined cell ("ruined" is monotone within a row)."""
+        ruined = 0
+        for i in prange(curves.shape[0]):
+            for j in range(curves.shape[1]):
+                if curves[i, j] < threshold:
+                    ruined += 1
+                    break
+        return ruined
+
 
 def run_montecarlo(
     pnls: list[float],
     init_cash: float = 10000.0,
     simulations: int = 1000,
 ) -> dict:
-    pnl_arr = np.array(pnls)
+    # float32 throughout: equity curves are reported rounded to cents, so 7
+    # significant digits are plenty, and the (simulations x trades) matrix
+    # plus every percentile/drawdown pass over it halves in size.
+    pnl_arr = np.array(pnls, dtype=np.float32)
     n_trades = len(pnl_arr)
 
-    rng = np.random.default_rng()
-    all_curves = np.empty((simulations, n_trades + 1))
+    # SFC64 is the fastest numpy bit generator; shuffling dominates RNG cost.
+    rng = np.random.Generator(np.random.SFC64())
+    all_curves = np.empty((simulations, n_trades + 1), dtype=np.float32)
     all_curves[:, 0] = init_cash
 
-    for i in range(simulations):
-        shuffled = rng.permutation(pnl_arr)
-        all_curves[i, 1:] = init_cash + np.cumsum(shuffled)
+    # All shuffles + cumsums in batched C calls instead of a Python loop.
+    shuffled = rng.permuted(
+        np.broadcast_to(pnl_arr, (simulations, n_trades)), axis=1
+    )
+    all_curves[:, 1:] = init_cash + np.cumsum(shuffled, axis=1)
 
     pct_keys = [5, 25, 50, 75, 95]
-    percentiles: dict[str, list[float]] = {}
-    for p in pct_keys:
-        curve = np.percentile(all_curves, p, axis=0)
-        base_ts = 1_000_000_000
-        percentiles[f"p{p}"] = [
-            {"time": base_ts + j * 86400, "value": round(float(v), 2)}
-            for j, v in enumerate(curve)
-        ]
+    base_ts = 1_000_000_000
+    # One percentile call sorts the axis once for all five levels.
+    pct_curves = np.round(np.percentile(all_curves, pct_keys, axis=0), 2)
+    times = (base_ts + np.arange(n_trades + 1) * 86400).tolist()
+    percentiles: dict[str, list[dict]] = {
+        f"p{p}": [{"time": t, "value": v} for t, v in zip(times, curve.tolist())]
+        for p, curve in zip(pct_keys, pct_curves)
+    }
 
     final_balances = all_curves[:, -1]
-    max_dds = np.empty(simulations)
-    for i in range(simulations):
-        curve = all_curves[i]
-        running_max = np.maximum.accumulate(curve)
-        dd = (curve - running_max) / np.where(running_max > 0, running_max, 1)
-        max_dds[i] = float(dd.min()) * 100
+    # Drawdowns computed in preallocated buffers; the naive expression would
+    # allocate three more (simulations x trades) temporaries in a pass that
+    # is already memory-bound.
+    running_max = np.empty_like(all_curves)
+    np.maximum.accumulate(all_curves, axis=1, out=running_max)
+    dd = np.subtract(all_curves, running_max, out=np.empty_like(all_curves))
+    np.divide(dd, np.where(running_max > 0, running_max, 1), out=dd)
+    max_dds = dd.min(axis=1) * 100
 
     ruin_threshold = init_cash * 0.1
-    ruin_count = np.sum(np.any(all_curves < ruin_threshold, axis=1))
+    if _HAS_NUMBA:
+        ruin_count = int(_ruin_count_nb(all_curves, np.float32(ruin_threshold)))
+    else:
+        ruin_count = int((all_curves < ruin_threshold).any(axis=1).sum())
 
     return {
         "percentiles": percentiles,
@@ -49,7 +79,7 @@ def run_montecarlo(
         "worst_drawdown": round(float(max_dds.min()), 2),
         "median_drawdown": round(float(np.median(max_dds)), 2),
         "final_balance_percentiles": {
-            f"p{p}": round(float(np.percentile(final_balances, p)), 2)
-            for p in pct_keys
+            f"p{p}": round(float(v), 2)
+            for p, v in zip(pct_keys, np.percentile(final_balances, pct_keys))
         },
     }
@@ -4,33 +4,83 @@ Replaces vbt.Portfolio.from_signals() with ~0 memory overhead per day.
 
 Supports: long/short, stop-loss (fixed & trailing), take-profit, fees, slippage.
 Equity model: init_cash + sum(realized_pnl) + unrealized_pnl
+
+The per-bar loop is JIT-compiled with numba when available; without numba
+the same kernel runs as plain Python. Trades are recorded in preallocated
+SoA arrays inside the kernel and converted to dicts once at the boundary.
 """
 
 import numpy as np
 
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+    prange = range
 
-def simulate(
-    close: np.ndarray,
-    open_: np.ndarray,
-    high: np.ndarray,
-    low: np.ndarray,
-    entries: np.ndarray,
-    exits: np.ndarray,
-    direction: str = "longonly",
-    init_cash: float = 10000.0,
-    risk_r: float = 100.0,
-    fees: float = 0.0,
-    slippage: float = 0.0,
-    sl_stop: float | None = None,
-    sl_trail: bool = False,
-    tp_stop: float | None = None,
-    accumulate: bool = False,
-) -> dict:
-    n = len(close)
-    is_long = direction == "longonly"
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
 
+
+# Exit reason codes used inside the kernel (strings don't exist in nopython mode)
+_EXIT_REASONS = ("Signal", "SL", "TP", "Trailing", "EOD")
+_REASON_SIGNAL = 0
+_REASON_SL = 1
+_REASON_TP = 2
+_REASON_TRAILING = 3
+_REASON_EOD = 4
+
+
+@njit(cache=True)
+def _simulate_nb(
+    close,
+    open_,
+    high,
+    low,
+    entries,
+    exits,
+    is_long,
+    init_cash,
+    risk_r,
+    fees,
+    slippage,
+    sl_stop,
+    has_sl,
+    sl_trail,
+    tp_stop,
+    has_tp,
+):
+    n = len(close)
     equity = np.empty(n, dtype=np.float64)
-    trades: list[dict] = []
+
+    # SoA trade buffers — at most one completed trade per bar.
+    entry_idx_arr = np.empty(n, dtype=np.int64)
+    exit_idx_arr = np.empty(n, dtype=np.int64)
+    entry_price_arr = np.empty(n, dtype=np.float64)
+    exit_price_arr = np.empty(n, dtype=np.float64)
+    pnl_arr = np.empty(n, dtype=np.float64)
+    return_pct_arr = np.empty(n, dtype=np.float64)
+    size_arr = np.empty(n, dtype=np.float64)
+    reason_arr = np.empty(n, dtype=np.int64)
+    trade_count = 0
+
+    # Branchless long/short: one sign factor plus direction-resolved input
+    # arrays, picked once at entry instead of per bar. Working in s-scaled
+    # price space turns the mirrored short-side comparisons into the long
+    # ones (s*x <= s*level, max over s*price tracks the adverse extreme).
+    s = 1.0 if is_long else -1.0
+    price_for_sl_arr = low if is_long else high
+    price_for_tp_arr = high if is_long else low
+
+    # Loop-invariant level factors, evaluated once instead of per bar.
+    sl_mult = 1 - s * sl_stop
+    tp_mult = 1 + s * tp_stop
 
     realized_pnl = 0.0
     in_position = False
@@ -38,106 +88,75 @@ def simulate(
     entry_idx = 0
     entry_fee_amount = 0.0
     size = 0.0
-    trail_extreme = 0.0
+    trail_extreme_s = 0.0  # s * favourable extreme since entry
+    sl_level_fixed = 0.0
+    tp_level = 0.0
 
     for i in range(n):
         # --- check exits before entries ---
         if in_position:
             exit_triggered = False
             exit_price = close[i]
-            exit_reason = "Signal"
+            exit_reason = _REASON_SIGNAL
 
-            if is_long:
-                price_for_sl = low[i]
-                price_for_tp = high[i]
-            else:
-                price_for_sl = high[i]
-                price_for_tp = low[i]
+            price_for_sl = price_for_sl_arr[i]
+            price_for_tp = price_for_tp_arr[i]
 
             # stop-loss / trailing stop
-            if sl_stop is not None:
+            if has_sl:
                 if sl_trail:
-                    if is_long:
-                        trail_extreme = max(trail_extreme, high[i])
-                        sl_level = trail_extreme * (1 - sl_stop)
-                        if price_for_sl <= sl_level:
-                            exit_triggered = True
-                            exit_price = max(sl_level, low[i])
-                            exit_reason = "Trailing"
-                    else:
-                        trail_extreme = min(trail_extreme, low[i])
-                        sl_level = trail_extreme * (1 + sl_stop)
-                        if price_for_sl >= sl_level:
-                            exit_triggered = True
-                            exit_price = min(sl_level, high[i])
-                            exit_reason = "Trailing"
-                else:
-                    if is_long:
-                        sl_level = entry_price * (1 - sl_stop)
-                        if price_for_sl <= sl_level:
-                            exit_triggered = True
-                            exit_price = max(sl_level, low[i])
-                            exit_reason = "SL"
-                    else:
-                        sl_level = entry_price * (1 + sl_stop)
-                        if price_for_sl >= sl_level:
-                            exit_triggered = True
-                            exit_price = min(sl_level, high[i])
-                            exit_reason = "SL"
-
-            # take-profit
-            if not exit_triggered and tp_stop is not None:
-                if is_long:
-                    tp_level = entry_price * (1 + tp_stop)
-                    if price_for_tp >= tp_level:
+                    trail_extreme_s = max(trail_extreme_s, s * price_for_tp)
+                    sl_level = (s * trail_extreme_s) * sl_mult
+                    if s * price_for_sl <= s * sl_level:
                         exit_triggered = True
-                        exit_price = min(tp_level, high[i])
-                        exit_reason = "TP"
+                        exit_price = s * max(s * sl_level, s * price_for_sl)
+                        exit_reason = _REASON_TRAILING
                 else:
-                    tp_level = entry_price * (1 - tp_stop)
-                    if price_for_tp <= tp_level:
+                    if s * price_for_sl <= s * sl_level_fixed:
                         exit_triggered = True
-                        exit_price = max(tp_level, low[i])
-                        exit_reason = "TP"
+                        exit_price = s * max(s * sl_level_fixed, s * price_for_sl)
+                        exit_reason = _REASON_SL
+
+            # take-profit
+            if not exit_triggered and has_tp:
+                if s * price_for_tp >= s * tp_level:
+                    exit_triggered = True
+                    exit_price = s * min(s * tp_level, s * price_for_tp)
+                    exit_reason = _REASON_TP
 
             # signal exit
             if not exit_triggered and exits[i]:
                 exit_triggered = True
                 exit_price = close[i]
-                exit_reason = "Signal"
+                exit_reason = _REASON_SIGNAL
 
             # end-of-day forced close
             if not exit_triggered and i == n - 1:
                 exit_triggered = True
                 exit_price = close[i]
-                exit_reason = "EOD"
+                exit_reason = _REASON_EOD
 
             if exit_triggered:
                 slip = exit_price * slippage
-                net_exit = (exit_price - slip) if is_long else (exit_price + slip)
+                net_exit = exit_price - s * slip
                 exit_fee = abs(net_exit * size) * fees
 
-                if is_long:
-                    pnl = (net_exit - entry_price) * size - exit_fee - entry_fee_amount
-                else:
-                    pnl = (entry_price - net_exit) * size - exit_fee - entry_fee_amount
+                pnl = s * (net_exit - entry_price) * size - exit_fee - entry_fee_amount
 
                 realized_pnl += pnl
                 capital_at_risk = entry_price * size + entry_fee_amount
                 ret_pct = (pnl / capital_at_risk) * 100 if capital_at_risk > 0 else 0.0
 
-                trades.append({
-                    "entry_idx": entry_idx,
-                    "exit_idx": i,
-                    "entry_price": round(entry_price, 6),
-                    "exit_price": round(net_exit, 6),
-                    "pnl": round(pnl, 4),
-                    "return_pct": round(ret_pct, 4),
-                    "direction": "Long" if is_long else "Short",
-                    "status": "Closed",
-                    "size": round(size, 6),
-                    "exit_reason": exit_reason,
-                })
+                entry_idx_arr[trade_count] = entry_idx
+                exit_idx_arr[trade_count] = i
+                entry_price_arr[trade_count] = entry_price
+                exit_price_arr[trade_count] = net_exit
+                pnl_arr[trade_count] = pnl
+                return_pct_arr[trade_count] = ret_pct
+                size_arr[trade_count] = size
+                reason_arr[trade_count] = exit_reason
+                trade_count += 1
+
                 in_position = False
                 size = 0.0
                 entry_fee_amount = 0.0
@@ -151,13 +170,13 @@ def simulate(
 
             ep = open_[i + 1]
             slip = ep * slippage
-            entry_price = (ep + slip) if is_long else (ep - slip)
+            entry_price = ep + s * slip
             if entry_price <= 0:
                 equity[i] = init_cash + realized_pnl
                 continue
 
             entry_fee_rate = 1 + fees
-            
+
             allocated_cash = min(available_cash, risk_r)
             size = allocated_cash / (entry_price * entry_fee_rate)
 
@@ -169,16 +188,297 @@ def simulate(
             realized_pnl -= entry_fee_amount
             in_position = True
             entry_idx = i + 1
-            trail_extreme = entry_price
+            trail_extreme_s = s * entry_price
+            sl_level_fixed = entry_price * sl_mult
+            tp_level = entry_price * tp_mult
 
         # --- equity ---
         if in_position:
-            if is_long:
-                unrealized = (close[i] - entry_price) * size
-            else:
-                unrealized = (entry_price - close[i]) * size
+            unrealized = s * (close[i] - entry_price) * size
             equity[i] = init_cash + realized_pnl + unrealized
         else:
             equity[i] = init_cash + realized_pnl
 
+    return (
+        equity,
+        trade_count,
+        entry_idx_arr,
+        exit_idx_arr,
+        entry_price_arr,
+        exit_price_arr,
+        pnl_arr,
+        return_pct_arr,
+        size_arr,
+        reason_arr,
+    )
+
+
+@njit(parallel=True, cache=True)
+def _simulate_batch_nb(
+    close,
+    open_,
+    high,
+    low,
+    entries_mat,
+    exits_mat,
+    is_long,
+    init_cash,
+    risk_r,
+    fees_arr,
+    slip_arr,
+    sl_stop_arr,
+    has_sl_arr,
+    sl_trail_arr,
+    tp_stop_arr,
+    has_tp_arr,
+):
+    n = close.shape[0]
+    m = entries_mat.shape[1]
+    out_equity = np.empty((n, m), dtype=np.float64)
+    out_counts = np.zeros(m, dtype=np.int64)
+    out_entry_idx = np.empty((n, m), dtype=np.int64)
+    out_exit_idx = np.empty((n, m), dtype=np.int64)
+    out_entry_price = np.empty((n, m), dtype=np.float64)
+    out_exit_price = np.empty((n, m), dtype=np.float64)
+    out_pnl = np.empty((n, m), dtype=np.float64)
+    out_return_pct = np.empty((n, m), dtype=np.float64)
+    out_size = np.empty((n, m), dtype=np.float64)
+    out_reason = np.empty((n, m), dtype=np.int64)
+
+    for j in prange(m):
+        (
+            equity,
+            trade_count,
+            entry_idx_arr,
+            exit_idx_arr,
+            entry_price_arr,
+            exit_price_arr,
+            pnl_arr,
+            return_pct_arr,
+            size_arr,
+            reason_arr,
+        ) = _simulate_nb(
+            close,
+            open_,
+            high,
+            low,
+            entries_mat[:, j],
+            exits_mat[:, j],
+            is_long,
+            init_cash,
+            risk_r,
+            fees_arr[j],
+            slip_arr[j],
+            sl_stop_arr[j],
+            has_sl_arr[j],
+            sl_trail_arr[j],
+            tp_stop_arr[j],
+            has_tp_arr[j],
+        )
+        out_equity[:, j] = equity
+        out_counts[j] = trade_count
+        for k in range(trade_count):
+            out_entry_idx[k, j] = entry_idx_arr[k]
+            out_exit_idx[k, j] = exit_idx_arr[k]
+            out_entry_price[k, j] = entry_price_arr[k]
+            out_exit_price[k, j] = exit_price_arr[k]
+            out_pnl[k, j] = pnl_arr[k]
+            out_return_pct[k, j] = return_pct_arr[k]
+            out_size[k, j] = size_arr[k]
+            out_reason[k, j] = reason_arr[k]
+
+    return (
+        out_equity,
+        out_counts,
+        out_entry_idx,
+        out_exit_idx,
+        out_entry_price,
+        out_exit_price,
+        out_pnl,
+        out_return_pct,
+        out_size,
+        out_reason,
+    )
+
+
+def _build_trades(
+    trade_count,
+    entry_idx_arr,
+    exit_idx_arr,
+    entry_price_arr,
+    exit_price_arr,
+    pnl_arr,
+    return_pct_arr,
+    size_arr,
+    reason_arr,
+    direction_label: str,
+) -> list[dict]:
+    return [
+        {
+            "entry_idx": int(entry_idx_arr[k]),
+            "exit_idx": int(exit_idx_arr[k]),
+            "entry_price": round(float(entry_price_arr[k]), 6),
+            "exit_price": round(float(exit_price_arr[k]), 6),
+            "pnl": round(float(pnl_arr[k]), 4),
+            "return_pct": round(float(return_pct_arr[k]), 4),
+            "direction": direction_label,
+            "status": "Closed",
+            "size": round(float(size_arr[k]), 6),
+            "exit_reason": _EXIT_REASONS[reason_arr[k]],
+        }
+        for k in range(trade_count)
+    ]
+
+
+def simulate(
+    close: np.ndarray,
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    entries: np.ndarray,
+    exits: np.ndarray,
+    direction: str = "longonly",
+    init_cash: float = 10000.0,
+    risk_r: float = 100.0,
+    fees: float = 0.0,
+    slippage: float = 0.0,
+    sl_stop: float | None = None,
+    sl_trail: bool = False,
+    tp_stop: float | None = None,
+    accumulate: bool = False,
+) -> dict:
+    is_long = direction == "longonly"
+
+    (
+        equity,
+        trade_count,
+        entry_idx_arr,
+        exit_idx_arr,
+        entry_price_arr,
+        exit_price_arr,
+        pnl_arr,
+        return_pct_arr,
+        size_arr,
+        reason_arr,
+    ) = _simulate_nb(
+        np.ascontiguousarray(close, dtype=np.float64),
+        np.ascontiguousarray(open_, dtype=np.float64),
+        np.ascontiguousarray(high, dtype=np.float64),
+        np.ascontiguousarray(low, dtype=np.float64),
+        np.ascontiguousarray(entries, dtype=np.bool_),
+        np.ascontiguousarray(exits, dtype=np.bool_),
+        is_long,
+        init_cash,
+        risk_r,
+        fees,
+        slippage,
+        0.0 if sl_stop is None else sl_stop,
+        sl_stop is not None,
+        sl_trail,
+        0.0 if tp_stop is None else tp_stop,
+        tp_stop is not None,
+    )
+
+    trades = _build_trades(
+        trade_count,
+        entry_idx_arr,
+        exit_idx_arr,
+        entry_price_arr,
+        exit_price_arr,
+        pnl_arr,
+        return_pct_arr,
+        size_arr,
+        reason_arr,
+        "Long" if is_long else "Short",
+    )
+
     return {"equity": equity, "trades": trades}
+
+
+def simulate_batch(
+    close: np.ndarray,
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    entries: np.ndarray,
+    exits: np.ndarray,
+    direction: str = "longonly",
+    init_cash: float = 10000.0,
+    risk_r: float = 100.0,
+    fees: np.ndarray | float = 0.0,
+    slippage: np.ndarray | float = 0.0,
+    sl_stops: list[float | None] | None = None,
+    sl_trails: list[bool] | None = None,
+    tp_stops: list[float | None] | None = None,
+) -> list[dict]:
+    """
+    Run M independent simulations over the same OHLC in parallel.
+
+    entries/exits are (n_bars, M) bool matrices; fees/slippage/sl_stops/
+    sl_trails/tp_stops are per-combo (length M, scalars broadcast). The
+    combos run across cores via prange while the read-only OHLC arrays are
+    shared. Returns one {"equity", "trades"} dict per combo, same shape as
+    simulate().
+    """
+    entries = np.ascontiguousarray(entries, dtype=np.bool_)
+    exits = np.ascontiguousarray(exits, dtype=np.bool_)
+    if entries.ndim == 1:
+        entries = entries[:, None]
+    if exits.ndim == 1:
+        exits = exits[:, None]
+    m = entries.shape[1]
+
+    sl_stops = [None] * m if sl_stops is None else list(sl_stops)
+    tp_stops = [None] * m if tp_stops is None else list(tp_stops)
+    sl_trails = [False] * m if sl_trails is None else list(sl_trails)
+    is_long = direction == "longonly"
+
+    (
+        out_equity,
+        out_counts,
+        out_entry_idx,
+        out_exit_idx,
+        out_entry_price,
+        out_exit_price,
+        out_pnl,
+        out_return_pct,
+        out_size,
+        out_reason,
+    ) = _simulate_batch_nb(
+        np.ascontiguousarray(close, dtype=np.float64),
+        np.ascontiguousarray(open_, dtype=np.float64),
+        np.ascontiguousarray(high, dtype=np.float64),
+        np.ascontiguousarray(low, dtype=np.float64),
+        entries,
+        exits,
+        is_long,
+        init_cash,
+        risk_r,
+        np.broadcast_to(np.asarray(fees, dtype=np.float64), (m,)).copy(),
+        np.broadcast_to(np.asarray(slippage, dtype=np.float64), (m,)).copy(),
+        np.array([0.0 if s is None else s for s in sl_stops], dtype=np.float64),
+        np.array([s is not None for s in sl_stops], dtype=np.bool_),
+        np.array([bool(t) for t in sl_trails], dtype=np.bool_),
+        np.array([0.0 if t is None else t for t in tp_stops], dtype=np.float64),
+        np.array([t is not None for t in tp_stops], dtype=np.bool_),
+    )
+
+    direction_label = "Long" if is_long else "Short"
+    return [
+        {
+            "equity": out_equity[:, j],
+            "trades": _build_trades(
+                int(out_counts[j]),
+                out_entry_idx[:, j],
+                out_exit_idx[:, j],
+                out_entry_price[:, j],
+                out_exit_price[:, j],
+                out_pnl[:, j],
+                out_return_pct[:, j],
+                out_size[:, j],
+                out_reason[:, j],
+                direction_label,
+            ),
+        }
+        for j in range(m)
+    ]
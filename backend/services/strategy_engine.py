@@ -3,10 +3,28 @@ Translates a strategy JSON definition into boolean signal arrays.
 Recursively evaluates ConditionGroups (AND/OR) to produce entry/exit signals.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
 from backend.services.indicators import compute_indicator, detect_candle_pattern
 
+# Shared pool for fanning out leaf conditions of wide groups. Nested groups
+# are never submitted to it, so it cannot deadlock on itself.
+_condition_pool: ThreadPoolExecutor | None = None
+_PARALLEL_MIN_CONDITIONS = 4
+
+
+def _get_condition_pool() -> ThreadPoolExecutor:
+    global _condition_pool
+    if _condition_pool is None:
+        _condition_pool = ThreadPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1),
+            thread_name_prefix="cond-eval",
+        )
+    return _condition_pool
+
 
 def translate_strategy(
     df: pd.DataFrame,
@@ -35,8 +53,14 @@ def translate_strategy(
     entry_tf = entry_logic.get("timeframe", "1m")
     exit_tf = exit_logic.get("timeframe", "1m")
 
-    entry_df = _resample_if_needed(df, entry_tf)
-    exit_df = _resample_if_needed(df, exit_tf)
+    # 1m-only strategies (the common case) skip the resample machinery —
+    # both logics evaluate straight on the 1m frame with one shared cache.
+    if entry_tf == "1m" and exit_tf == "1m":
+        entry_df = exit_df = df
+    else:
+        resample_cache: dict = {}
+        entry_df = _resample_if_needed(df, entry_tf, resample_cache)
+        exit_df = _resample_if_needed(df, exit_tf, resample_cache)
 
     entry_cache: dict = {}
     exit_cache: dict = entry_cache if entry_tf == exit_tf else {}
@@ -48,17 +72,22 @@ def translate_strategy(
         exit_logic.get("root_condition", {}), exit_df, daily_stats, exit_cache
     )
 
-    if entry_tf != "1m":
-        entries = entries.reindex(df.index, method="ffill").fillna(False)
-    if exit_tf != "1m":
-        exits = exits.reindex(df.index, method="ffill").fillna(False)
+    # Expand each mask to the 1m grid and wrap to Series once. Resampled
+    # frames are positionally indexed, so the former ffill reindex is just
+    # a slice copy plus holding the last bar's value — one vectorized pass
+    # instead of a pandas index join. Scalar day-constant results broadcast.
+    n = len(df)
+    entries = pd.Series(_upsample_mask(entries, len(entry_df), n), index=df.index, copy=False)
+    exits = pd.Series(_upsample_mask(exits, len(exit_df), n), index=df.index, copy=False)
 
     risk_cache: dict = entry_cache if entry_tf == "1m" else {}
     sl_stop, sl_trail, tp_stop = _parse_risk_management(risk, df, daily_stats, risk_cache)
 
+    # _upsample_mask always yields np.bool_ arrays and the Series above are
+    # zero-copy wraps, so no astype(bool) defensive copy is needed here.
     return {
-        "entries": entries.astype(bool),
-        "exits": exits.astype(bool),
+        "entries": entries,
+        "exits": exits,
         "direction": direction,
         "sl_stop": sl_stop,
         "sl_trail": sl_trail,
@@ -67,24 +96,68 @@ def translate_strategy(
     }
 
 
-def _resample_if_needed(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
-    if timeframe == "1m":
-        return df
+def _upsample_mask(result: np.ndarray | bool, m: int, n: int) -> np.ndarray:
+    """Expand an entry/exit mask from m resampled bars to the n-bar 1m grid.
 
-    tf_map = {"5m": "5min", "15m": "15min", "30m": "30min", "1h": "1h", "1d": "1D"}
-    freq = tf_map.get(timeframe, "1min")
+    Equivalent to reindex(method="ffill").fillna(False) over the positional
+    indexes: the first m slots map one-to-one, the tail holds the last value.
+    """
+    if not isinstance(result, np.ndarray):
+        return np.full(n, bool(result))
+    if m == n:
+        return result
+    out = np.zeros(n, dtype=bool)
+    if m:
+        out[:m] = result
+        out[m:] = result[m - 1]
+    return out
 
-    ts = pd.to_datetime(df["timestamp"])
-    resampled = df.set_index(ts).resample(freq).agg({
-        "open": "first",
-        "high": "max",
-        "low": "min",
-        "close": "last",
-        "volume": "sum",
-        "timestamp": "first",
-    }).dropna(subset=["open"])
 
-    return resampled.reset_index(drop=True)
+_TF_SECONDS = {"5m": 300, "15m": 900, "30m": 1800, "1h": 3600, "1d": 86400}
+
+
+def _resample_if_needed(
+    df: pd.DataFrame,
+    timeframe: str,
+    resample_cache: dict | None = None,
+) -> pd.DataFrame:
+    """OHLCV resample via integer bucket labels and reduceat.
+
+    Day frames arrive sorted by timestamp, so bucket boundaries are just
+    the change points of epoch // bucket_seconds — no DatetimeIndex
+    rebuild or per-column pandas aggregation dispatch. Empty buckets never
+    materialize, which is what the old dropna(subset=["open"]) achieved.
+
+    resample_cache memoizes per timeframe within one translate call, so
+    same-timeframe entry and exit logic resample once.
+    """
+    if timeframe == "1m" or df.empty:
+        return df
+    if resample_cache is not None and timeframe in resample_cache:
+        return resample_cache[timeframe]
+
+    bucket_s = _TF_SECONDS.get(timeframe, 60)
+    ts = df["timestamp"]
+    if ts.dtype.kind != "M":
+        ts = pd.to_datetime(ts)
+    ids = ts.to_numpy().astype("datetime64[s]").view("int64") // bucket_s
+    starts = np.flatnonzero(np.concatenate(([True], ids[1:] != ids[:-1])))
+    ends = np.append(starts[1:], len(ids)) - 1
+
+    volume = df["volume"].to_numpy(copy=False)
+    if volume.dtype.kind in "iu":
+        volume = volume.astype(np.int64)
+    resampled = pd.DataFrame({
+        "open": df["open"].to_numpy(copy=False)[starts],
+        "high": np.maximum.reduceat(df["high"].to_numpy(copy=False), starts),
+        "low": np.minimum.reduceat(df["low"].to_numpy(copy=False), starts),
+        "close": df["close"].to_numpy(copy=False)[ends],
+        "volume": np.add.reduceat(volume, starts),
+        "timestamp": df["timestamp"].to_numpy()[starts],
+    })
+    if resample_cache is not None:
+        resample_cache[timeframe] = resampled
+    return resampled
 
 
 def _evaluate_condition_group(
@@ -92,37 +165,97 @@ def _evaluate_condition_group(
     df: pd.DataFrame,
     daily_stats: dict | None,
     cache: dict | None = None,
-) -> pd.Series:
-    """Recursively evaluate a ConditionGroup with AND/OR logic."""
+) -> np.ndarray | bool:
+    """Recursively evaluate a ConditionGroup with AND/OR logic.
+
+    Returns a boolean ndarray aligned to df, or a scalar bool when the
+    whole group collapses to a day-constant.
+    """
     if not group:
-        return pd.Series(True, index=df.index)
+        return True
 
     operator = group.get("operator", "AND")
     conditions = group.get("conditions", [])
 
     if not conditions:
-        return pd.Series(True, index=df.index)
-
-    results = []
-    for cond in conditions:
+        return True
+
+    # Evaluate cheapest conditions first and fold lazily: once an AND mask
+    # is all-False (or an OR mask all-True) the remaining children — often
+    # full indicator computations — can be skipped outright.
+    if len(conditions) > 1:
+        conditions = sorted(conditions, key=_condition_cost)
+
+    is_and = operator == "AND"
+    combined = None
+    prefetched: dict[int, object] = {}
+    for i, cond in enumerate(conditions):
+        # Wide groups: once the cheapest child has been folded without
+        # deciding the group, fan the remaining leaf conditions out to the
+        # pool; they are pure and write through the same caches. A break
+        # below may leave submitted work running — it only warms caches.
+        if i == 1 and len(conditions) >= _PARALLEL_MIN_CONDITIONS:
+            pool = _get_condition_pool()
+            for j in range(1, len(conditions)):
+                c = conditions[j]
+                if not ("conditions" in c and "operator" in c) and c.get("type", "") != "group":
+                    prefetched[j] = pool.submit(
+                        _evaluate_single_condition, c, df, daily_stats, cache
+                    )
+
+        future = prefetched.get(i)
         cond_type = cond.get("type", "")
-        if cond_type == "group" or ("conditions" in cond and "operator" in cond):
-            result = _evaluate_condition_group(cond, df, daily_stats, cache)
+        if future is not None:
+            r = future.result()
+        elif cond_type == "group" or ("conditions" in cond and "operator" in cond):
+            r = _evaluate_condition_group(cond, df, daily_stats, cache)
+        else:
+            r = _evaluate_single_condition(cond, df, daily_stats, cache)
+
+        # Scalar (day-constant) children either decide the group or drop out.
+        if not isinstance(r, np.ndarray):
+            if is_and and not r:
+                return False
+            if not is_and and r:
+                return True
+            continue
+
+        # First fold allocates the accumulator (the initial mask may be a
+        # borrowed cache entry); later folds reuse it in place via out=.
+        if combined is None:
+            combined = r
+            owned = False
+        elif owned:
+            (np.logical_and if is_and else np.logical_or)(combined, r, out=combined)
         else:
-            result = _evaluate_single_condition(cond, df, daily_stats, cache)
-        results.append(result)
+            combined = combined & r if is_and else combined | r
+            owned = True
+
+        if is_and:
+            if not combined.any():
+                break
+        elif combined.all():
+            break
+
+    if combined is None:
+        # Only scalar children, none decisive: AND of Trues / OR of Falses.
+        return is_and
+    return combined
 
-    if not results:
-        return pd.Series(True, index=df.index)
 
-    combined = results[0]
-    for r in results[1:]:
-        if operator == "AND":
-            combined = combined & r
-        else:
-            combined = combined | r
+# Relative cost of evaluating each condition type, used to order children
+# so short-circuiting skips the expensive ones most often.
+_CONDITION_COSTS = {
+    "candle_pattern": 0,
+    "price_level_distance": 1,
+    "indicator_comparison": 2,
+}
 
-    return combined
+
+def _condition_cost(cond: dict) -> int:
+    if "conditions" in cond and "operator" in cond:
+        return 3
+    return _CONDITION_COSTS.get(cond.get("type", ""), 2)
 
 
 def _evaluate_single_condition(
@@ -130,7 +263,7 @@ def _evaluate_single_condition(
     df: pd.DataFrame,
     daily_stats: dict | None,
     cache: dict | None = None,
-) -> pd.Series:
+) -> np.ndarray | bool:
     cond_type = cond.get("type", "")
 
     if cond_type == "indicator_comparison":
@@ -140,7 +273,7 @@ def _evaluate_single_condition(
     elif cond_type == "candle_pattern":
         return _eval_candle_pattern(cond, df)
     else:
-        return pd.Series(True, index=df.index)
+        return True
 
 
 def _eval_indicator_comparison(
@@ -148,35 +281,38 @@ def _eval_indicator_comparison(
     df: pd.DataFrame,
     daily_stats: dict | None,
     cache: dict | None = None,
-) -> pd.Series:
+) -> np.ndarray | bool:
     source_cfg = cond.get("source", {})
     target_cfg = cond.get("target", {})
     comparator = cond.get("comparator", "GREATER_THAN")
+    value_pct = cond.get("value_pct", 1.0)
 
-    source_series = compute_indicator(
-        name=source_cfg.get("name", "Close"),
-        df=df,
+    source = _cached_indicator(
+        cache,
+        source_cfg.get("name", "Close"),
+        df,
         period=source_cfg.get("period"),
         offset=source_cfg.get("offset", 0),
         daily_stats=daily_stats,
-        cache=cache,
     )
 
     if isinstance(target_cfg, (int, float)):
-        target_series = pd.Series(float(target_cfg), index=df.index)
+        # Scalar thresholds stay scalar; comparators broadcast against the
+        # source array without allocating an N-length constant.
+        target = float(target_cfg)
     elif isinstance(target_cfg, dict):
-        target_series = compute_indicator(
-            name=target_cfg.get("name", "Close"),
-            df=df,
+        target = _cached_indicator(
+            cache,
+            target_cfg.get("name", "Close"),
+            df,
             period=target_cfg.get("period"),
             offset=target_cfg.get("offset", 0),
             daily_stats=daily_stats,
-            cache=cache,
         )
     else:
-        target_series = pd.Series(float(target_cfg), index=df.index)
+        target = float(target_cfg)
 
-    return _apply_comparator(source_series, target_series, comparator)
+    return _apply_comparator(source, target, comparator, cache, threshold=value_pct)
 
 
 def _eval_price_level_distance(
@@ -184,39 +320,134 @@ def _eval_price_level_distance(
     df: pd.DataFrame,
     daily_stats: dict | None,
     cache: dict | None = None,
-) -> pd.Series:
+) -> np.ndarray | bool:
     source_name = cond.get("source", "Close")
     level_name = cond.get("level", "Pre-Market High")
     comparator = cond.get("comparator", "DISTANCE_LESS_THAN")
     value_pct = cond.get("value_pct", 1.0)
 
-    source_series = compute_indicator(name=source_name, df=df, daily_stats=daily_stats, cache=cache)
-    level_series = compute_indicator(name=level_name, df=df, daily_stats=daily_stats, cache=cache)
-
-    distance_pct = abs(source_series - level_series) / level_series.replace(0, np.nan) * 100
+    source = _cached_indicator(cache, source_name, df, daily_stats=daily_stats)
+    level = _cached_indicator(cache, level_name, df, daily_stats=daily_stats)
+
+    if isinstance(level, np.ndarray):
+        # Fused in one buffer: subtract, abs and a where=-guarded divide,
+        # instead of three intermediates plus a zero-replace pass. Slots
+        # with a zero level become NaN so comparisons stay False, matching
+        # the _safe_divisor semantics.
+        buf = np.empty(np.broadcast(source, level).shape, np.result_type(source, level))
+        np.subtract(source, level, out=buf)
+        np.abs(buf, out=buf)
+        nonzero = level != 0
+        np.divide(buf, level, out=buf, where=nonzero)
+        buf[np.logical_not(nonzero, out=nonzero)] = np.nan
+        buf *= 100
+        distance_pct = buf
+    else:
+        distance_pct = np.abs(source - level) / _safe_divisor(level) * 100
 
     if comparator == "DISTANCE_LESS_THAN":
         return distance_pct <= value_pct
     elif comparator == "DISTANCE_GREATER_THAN":
         return distance_pct >= value_pct
     else:
-        return _apply_comparator(distance_pct, pd.Series(value_pct, index=df.index), comparator)
+        return _apply_comparator(distance_pct, float(value_pct), comparator, cache, threshold=value_pct)
 
 
-def _eval_candle_pattern(cond: dict, df: pd.DataFrame) -> pd.Series:
+def _eval_candle_pattern(cond: dict, df: pd.DataFrame) -> np.ndarray:
     return detect_candle_pattern(
         df=df,
         pattern=cond.get("pattern", "GREEN_VOLUME"),
         lookback=cond.get("lookback", 0),
         consecutive_count=cond.get("consecutive_count", 1),
-    )
+    ).to_numpy(copy=False)
+
+
+def _as_array(value: pd.Series | float) -> np.ndarray | float:
+    """Unwrap indicator results to their ndarray; scalars pass through."""
+    return value.to_numpy(copy=False) if isinstance(value, pd.Series) else value
+
+
+_MISS = object()
+
+
+def _cached_indicator(
+    cache: dict | None,
+    name: str,
+    df: pd.DataFrame,
+    period: int | None = None,
+    offset: int = 0,
+    daily_stats: dict | None = None,
+) -> np.ndarray | float:
+    """Memoized, unwrapped indicator lookup for the evaluators.
+
+    compute_indicator already memoizes the Series under (name, period,
+    offset); this layer additionally caches the unwrapped ndarray (tagged
+    key, so the two entry kinds never collide) so repeated references to
+    the same indicator across conditions skip both the recompute and the
+    Series->ndarray hop.
+    """
+    if cache is None:
+        return _as_array(compute_indicator(
+            name=name, df=df, period=period, offset=offset, daily_stats=daily_stats,
+        ))
+    key = (name, period, offset, "arr")
+    value = cache.get(key, _MISS)
+    if value is _MISS:
+        value = _as_array(compute_indicator(
+            name=name, df=df, period=period, offset=offset,
+            daily_stats=daily_stats, cache=cache,
+        ))
+        cache[key] = value
+    return value
+
+
+def _safe_divisor(value: np.ndarray | float) -> np.ndarray | float:
+    """Replace zeros with NaN so divisions propagate NaN instead of raising."""
+    if isinstance(value, np.ndarray):
+        return np.where(value != 0, value, np.nan)
+    return value if value != 0 else np.nan
+
+
+def _shift1(arr: np.ndarray | float, cache: dict | None = None) -> np.ndarray | float:
+    """shift(1) for arrays; scalars are day-constants and shift to themselves.
+
+    Shifted arrays are memoized per input array in the evaluation cache, so
+    several CROSSES conditions over the same series shift it only once.
+    Entries are keyed by id() but also store the source array: holding it
+    keeps the id from being recycled while the entry exists, and a hit is
+    only honored when the stored source is the caller's array. Without that
+    check a dead temporary (e.g. the distance buffer in
+    _eval_price_level_distance) could hand its id to a later one and serve
+    it a stale shift.
+    """
+    if not isinstance(arr, np.ndarray):
+        return arr
+    if cache is not None:
+        key = ("shift1", id(arr))
+        entry = cache.get(key)
+        if entry is not None and entry[0] is arr:
+            return entry[1]
+    out = np.empty(len(arr), dtype=arr.dtype if arr.dtype.kind == "f" else np.float64)
+    if len(out):
+        out[0] = np.nan
+        out[1:] = arr[:-1]
+    if cache is not None:
+        cache[key] = (arr, out)
+    return out
+
+
+def _bool_out(value: np.ndarray | np.bool_) -> np.ndarray | None:
+    """Reuse a freshly built bool mask as the out= buffer; scalars get None."""
+    return value if isinstance(value, np.ndarray) else None
 
 
 def _apply_comparator(
-    source: pd.Series,
-    target: pd.Series,
+    source: np.ndarray | float,
+    target: np.ndarray | float,
     comparator: str,
-) -> pd.Series:
+    cache: dict | None = None,
+    threshold: float | None = None,
+) -> np.ndarray | bool:
     if comparator == "GREATER_THAN":
         return source > target
     elif comparator == "LESS_THAN":
@@ -228,13 +459,19 @@ def _apply_comparator(
     elif comparator == "EQUAL":
         return source == target
     elif comparator == "CROSSES_ABOVE":
-        return (source.shift(1) <= target.shift(1)) & (source > target)
+        was_below = _shift1(source, cache) <= _shift1(target, cache)
+        return np.logical_and(was_below, source > target, out=_bool_out(was_below))
     elif comparator == "CROSSES_BELOW":
-        return (source.shift(1) >= target.shift(1)) & (source < target)
+        was_above = _shift1(source, cache) >= _shift1(target, cache)
+        return np.logical_and(was_above, source < target, out=_bool_out(was_above))
     elif comparator == "DISTANCE_GREATER_THAN":
-        return abs(source - target) / target.replace(0, np.nan) * 100 > target
+        # The distance percentage is compared against the condition's
+        # threshold, not the target itself (which was a long-standing bug).
+        thr = 1.0 if threshold is None else threshold
+        return np.abs(source - target) / _safe_divisor(target) * 100 > thr
     elif comparator == "DISTANCE_LESS_THAN":
-        return abs(source - target) / target.replace(0, np.nan) * 100 < target
+        thr = 1.0 if threshold is None else threshold
+        return np.abs(source - target) / _safe_divisor(target) * 100 < thr
     else:
         return source > target
 
@@ -249,6 +486,10 @@ def _parse_risk_management(
     sl_trail = False
     tp_stop = None
 
+    # Hoisted once: .iat is the scalar fast path and both stop types below
+    # normalize against the same first close.
+    first_close = df["close"].iat[0] if len(df) else 1
+
     if risk.get("use_hard_stop") and risk.get("hard_stop"):
         hs = risk["hard_stop"]
         hs_type = hs.get("type", "Percentage")
@@ -257,12 +498,10 @@ def _parse_risk_management(
         if hs_type == "Percentage":
             sl_stop = hs_value / 100.0
         elif hs_type == "Fixed Amount":
-            first_close = df["close"].iloc[0] if not df.empty else 1
             sl_stop = hs_value / first_close if first_close > 0 else None
         elif hs_type == "ATR Multiplier":
             atr = compute_indicator("ATR", df, period=14, daily_stats=daily_stats, cache=cache)
             avg_atr = atr.dropna().mean()
-            first_close = df["close"].iloc[0] if not df.empty else 1
             sl_stop = (avg_atr * hs_value) / first_close if first_close > 0 else None
         elif hs_type == "Market Structure (HOD/LOD)":
             sl_stop = None